@@ -1,67 +1,139 @@
-import random
+import secrets
 import string
 import hashlib
+from functools import lru_cache
+from types import MappingProxyType
+
+# Opt-in: hash the security-critical second stage with SHA-256 instead of
+# SHA-512. It is faster on CPUs with SHA extensions, but the 64-character
+# digest gives calculate_character_sum half as many summands, so only about
+# half as many sums (and final numbers) are reachable.
+_USE_SHA256 = False
+
+_ALPHABET = (string.ascii_letters + string.digits).encode()  # a-zA-Z0-9
+# Maps bytes 0..247 onto the alphabet; 248..255 are deleted so every
+# character stays equally likely (248 is the largest multiple of 62 <= 256)
+_ALPHABET_TABLE = bytes(_ALPHABET[x % len(_ALPHABET)] for x in range(248)) + bytes(8)
+_REJECTED = bytes(range(248, 256))
+
+def _random_alphanumeric(length):
+    out = b''
+    while len(out) < length:
+        out += secrets.token_bytes(length - len(out)).translate(_ALPHABET_TABLE, _REJECTED)
+    return out
 
 def generate_random_string(length=25):
-    characters = string.ascii_letters + string.digits  # a-zA-Z0-9
-    random_string = ''.join(random.choices(characters, k=length))
+    random_string = _random_alphanumeric(length).decode('ascii')
     return random_string
 
+def generate_salt_bytes(length=6):
+    return _random_alphanumeric(length)
+
 def generate_salt(length=6):
-    characters = string.ascii_letters + string.digits  # a-zA-Z0-9
-    salt = ''.join(random.choices(characters, k=length))
+    salt = generate_salt_bytes(length).decode('ascii')
     return salt
 
 def hash_with_salt(input_string):
-    sha512_hash = hashlib.sha512(input_string.encode()).hexdigest()
-    front_salt = generate_salt()
-    back_salt = generate_salt()
-    salted_hash = front_salt + sha512_hash + back_salt
-    return salted_hash
+    sha512_hash = hashlib.sha512(input_string.encode()).hexdigest().encode()
+    # Assemble in bytes and decode once at the end
+    salted_hash = b''.join((generate_salt_bytes(), sha512_hash, generate_salt_bytes()))
+    return salted_hash.decode('ascii')
+
+def _second_stage_hash(security_critical):
+    if not security_critical:
+        # BLAKE2b is faster than SHA-512 for short inputs with the same 64-byte output
+        return hashlib.blake2b(digest_size=64)
+    if _USE_SHA256:
+        return hashlib.sha256()
+    return hashlib.sha512()
+
+def double_hash_base64(input_string, security_critical=True):
+    h = _second_stage_hash(security_critical)
+    h.update(input_string.encode())
+    return h.hexdigest()
+
+def fused_hash(input_string, security_critical=True):
+    # Same steps as double_hash_base64(hash_with_salt(...)), but the salts and
+    # the raw inner digest go straight into one hasher with no hex round-trip
+    inner = hashlib.sha512(input_string.encode()).digest()
+    h = _second_stage_hash(security_critical)
+    h.update(generate_salt_bytes())
+    h.update(inner)
+    h.update(generate_salt_bytes())
+    return h.hexdigest()
 
-def double_hash_base64(input_string):
-    sha512_hash = hashlib.sha512(input_string.encode()).hexdigest()
-    return sha512_hash
+# Built once at import time; the lookup tables below are derived from it, and
+# calculate_character_sum reads it directly only for code points above U+00FF
+_CHAR_MAP = {
+    **{char: idx for idx, char in enumerate(string.ascii_lowercase, start=1)},
+    **{char: idx for idx, char in enumerate(string.ascii_uppercase, start=28)},
+    **{char: idx for idx, char in enumerate(string.digits, start=55)},
+}
 
+@lru_cache(maxsize=1)
 def char_to_number_mapping():
-    mapping = {}
-    for idx, char in enumerate(string.ascii_lowercase, start=1):
-        mapping[char] = idx
-    for idx, char in enumerate(string.ascii_uppercase, start=28):
-        mapping[char] = idx
-    for idx, char in enumerate(string.digits, start=55):
-        mapping[char] = idx
-    return mapping
+    # Read-only view, so the cached mapping can't be changed by callers
+    return MappingProxyType(_CHAR_MAP)
+
+# Per-code-point values for U+0000..U+00FF; special characters can exceed a byte
+_LUT = tuple(_CHAR_MAP.get(chr(i), i + 66) for i in range(256))
+
+# ASCII values top out at 127 + 66 = 193, so that half of _LUT fits in bytes
+_BYTE_LUT = bytes(_LUT[:128]) + bytes(128)
 
 def calculate_character_sum(input_string):
-    mapping = char_to_number_mapping()
-    total_sum = 0
-    for char in input_string:
-        if char in mapping:
-            total_sum += mapping[char]
-        else:
-            total_sum += ord(char) + 66  # Adding 66 for special characters
-    return total_sum
-
-def reduce_to_six_digits(character_sum):
-    hashed_number = hashlib.sha256(str(character_sum).encode()).hexdigest()[:6]
-    six_digit_number = int(hashed_number, 16)  # Convert the hexadecimal hash to an integer
+    if input_string.isascii():
+        return sum(input_string.encode('ascii').translate(_BYTE_LUT))
+    try:
+        data = input_string.encode('latin-1')
+    except UnicodeEncodeError:
+        # Code points above U+00FF fall outside the table
+        total_sum = 0
+        for char in input_string:
+            if char in _CHAR_MAP:
+                total_sum += _CHAR_MAP[char]
+            else:
+                total_sum += ord(char) + 66  # Adding 66 for special characters
+        return total_sum
+    return sum(map(_LUT.__getitem__, data))
+
+_HEX_DIGITS = b'0123456789abcdef'
+_HEX_TABLE = bytes.maketrans(_HEX_DIGITS, bytes(_CHAR_MAP[c] for c in _HEX_DIGITS.decode()))
+
+def _calculate_character_sum_hex(hex_string):
+    # Only for hash_pipeline's lowercase hex digests; any other input sums wrongly
+    return sum(hex_string.encode('ascii').translate(_HEX_TABLE))
+
+def reduce_to_six_digits(character_sum, security_critical=True):
+    if character_sum < 0:
+        raise ValueError(f"character_sum must be non-negative, got {character_sum}")
+    # Hash the integer's own bytes rather than its decimal string
+    data = character_sum.to_bytes((character_sum.bit_length() + 7) // 8 or 1, 'big')
+    if not security_critical:
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % 1000000
+    # The first 3 digest bytes are the same 24 bits as the first 6 hex digits
+    six_digit_number = int.from_bytes(hashlib.sha256(data).digest()[:3], 'big')
     return six_digit_number % 1000000
 
-# Generate random string
-random_string = generate_random_string()
+def hash_pipeline():
+    # Generate random string
+    random_string = generate_random_string()
+
+    # Salt and double hash the string
+    double_hashed_string = fused_hash(random_string, security_critical=False)
 
-# Generate SHA-512 hash with salt
-hashed_string = hash_with_salt(random_string)
+    # Calculate the character sum
+    character_sum = _calculate_character_sum_hex(double_hashed_string)
 
-# Double hash the string
-double_hashed_string = double_hash_base64(hashed_string)
+    # Reduce to a six-digit number
+    return reduce_to_six_digits(character_sum, security_critical=False)
 
-# Calculate the character sum
-character_sum = calculate_character_sum(double_hashed_string)
+def main():
+    six_digit_number = hash_pipeline()
 
-# Reduce to a six-digit number
-six_digit_number = reduce_to_six_digits(character_sum)
+    # Print the six-digit number
+    print(f"Six Digit Number: {six_digit_number:06}")  # Ensure it's printed with leading zeros if necessary
 
-# Print the six-digit number
-print(f"Six Digit Number: {six_digit_number:06}")  # Ensure it's printed with leading zeros if necessary
+if __name__ == "__main__":
+    main()